@@ -4,7 +4,7 @@ import pyqtgraph as pg
 import pyqtgraph.opengl as gl
 from pyqtgraph.dockarea import DockArea, Dock
 from PyQt5.QtWidgets import QApplication, QMainWindow, QWidget, QVBoxLayout, QLabel
-from PyQt5.QtCore import QTimer, Qt
+from PyQt5.QtCore import QTimer, Qt, QObject, pyqtSignal
 from sensor_manager import SensorManager # Refactored data source
 from sensor_fusion import SensorFusion # Refactored math engine
 from views.acc_gyro_view import AccGyroView # New view for 2D plots
@@ -19,8 +19,19 @@ BAUD_RATE = 115200
 ENABLE_POSITION_DAMPING = False # Set to True to prevent position drift (resets velocity)
 ACCELERATION_DEADZONE = 50 # Set a threshold for linear acceleration to reduce drift. 0.0 to disable.
 G = 9.81  # Gravity constant in mm/s²
+MAX_DT = 0.1 # Upper bound (s) for the integration time step
 # ---------------------
 
+# Render the 2D plot curves through OpenGL instead of building a QPainterPath
+# every frame (PyOpenGL is already required by pyqtgraph.opengl above).
+# Must be set before any plot widget is created.
+pg.setConfigOptions(useOpenGL=True, enableExperimental=True, antialias=False)
+
+class SampleNotifier(QObject):
+    """Carries 'new sample' and error notifications from the serial reader thread to the GUI thread."""
+    sample_ready = pyqtSignal()
+    error = pyqtSignal(str)
+
 class Dashboard(QMainWindow):
     def __init__(self):
         global SIMULATION_MODE  # DO NOT REMOVE THIS LINE, it's necessary
@@ -30,7 +41,7 @@ class Dashboard(QMainWindow):
 
         # Initialize sensor fusion engine
         self.sensor_fusion = SensorFusion(damping=ENABLE_POSITION_DAMPING, deadzone=ACCELERATION_DEADZONE)
-        self.last_update_time = time.time()
+        self.last_update_ns = time.monotonic_ns()
         
         # 1. Setup DockArea
         self.area = DockArea()
@@ -76,22 +87,14 @@ class Dashboard(QMainWindow):
         line_thickness = 3 # Adjust as needed
         axis_length = 1    # Length 1 as requested
 
-        self.axes_items = []
-
-        # X-axis (Red)
-        self.x_axis = gl.GLLinePlotItem(pos=np.array([[0,0,0], [axis_length,0,0]]), color=(1,0,0,1), width=line_thickness)
-        self.w_3d.addItem(self.x_axis)
-        self.axes_items.append(self.x_axis)
-
-        # Y-axis (Green)
-        self.y_axis = gl.GLLinePlotItem(pos=np.array([[0,0,0], [0,axis_length,0]]), color=(0,1,0,1), width=line_thickness)
-        self.w_3d.addItem(self.y_axis)
-        self.axes_items.append(self.y_axis)
-
-        # Z-axis (Blue)
-        self.z_axis = gl.GLLinePlotItem(pos=np.array([[0,0,0], [0,0,axis_length]]), color=(0,0,1,1), width=line_thickness)
-        self.w_3d.addItem(self.z_axis)
-        self.axes_items.append(self.z_axis)
+        # X (Red), Y (Green) and Z (Blue) axes as a single item drawn with
+        # GL_LINES: one vertex pair and color pair per axis, one draw call
+        axes_pos = np.array([[0,0,0], [axis_length,0,0],
+                             [0,0,0], [0,axis_length,0],
+                             [0,0,0], [0,0,axis_length]], dtype=np.float32)
+        axes_color = np.array([(1,0,0,1)] * 2 + [(0,1,0,1)] * 2 + [(0,0,1,1)] * 2, dtype=np.float32)
+        self.axes = gl.GLLinePlotItem(pos=axes_pos, color=axes_color, width=line_thickness, mode='lines')
+        self.w_3d.addItem(self.axes)
         
         self.d_3d.addWidget(self.w_3d)
 
@@ -117,56 +120,96 @@ class Dashboard(QMainWindow):
         self.sensor_manager = SensorManager(SERIAL_PORT, BAUD_RATE, SIMULATION_MODE)
 
         self.timer = QTimer()
-        self.timer.timeout.connect(self.update)
-        self.timer.start(20) # 50 Hz update rate
+        if self.sensor_manager.simulation_mode:
+            self.timer.timeout.connect(self.update)
+            self.timer.start(20) # 50 Hz update rate
+        else:
+            # Real Mode: update when the reader thread delivers a packet instead of
+            # polling. The single-shot timer caps updates at one per 20 ms frame and
+            # coalesces packets arriving within it into one update at its end.
+            self.update_pending = False
+            self.timer.setSingleShot(True)
+            self.timer.setInterval(20)
+            self.timer.timeout.connect(self.on_frame_end)
+
+            self.sample_notifier = SampleNotifier()
+            self.sample_notifier.sample_ready.connect(self.on_sample_ready, Qt.QueuedConnection)
+            self.sensor_manager.on_sample = self.sample_notifier.sample_ready.emit
+            self.sample_notifier.error.connect(self.on_serial_error, Qt.QueuedConnection)
+            self.sensor_manager.on_error = self.sample_notifier.error.emit
+            if self.sensor_manager.error is not None:
+                self.on_serial_error(self.sensor_manager.error) # Failed before on_error was set
         
         self.sim_t = 0
 
+    def on_sample_ready(self):
+        if self.timer.isActive():
+            self.update_pending = True # Picked up at the end of the current frame
+        else:
+            self.update()
+            self.timer.start()
+
+    def on_serial_error(self, message):
+        # The reader thread has stopped: show why instead of silently freezing
+        self.statusBar().showMessage(f"Serial connection lost ({message})")
+
+    def on_frame_end(self):
+        if self.update_pending:
+            self.update_pending = False
+            self.update()
+            self.timer.start()
+
+    def closeEvent(self, event):
+        self.timer.stop()
+        self.sensor_manager.close() # Stop the serial reader thread
+        super().closeEvent(event)
+
     def update(self):
         # --- 1. GET NEW SENSOR DATA ---
-        new_data = self.sensor_manager.get_next_sample()
-        
-        if new_data is None:
+        sensor_manager = self.sensor_manager
+        if not sensor_manager.poll():
             return # No data available
             
         # Handle 9-axis data (Acc, Gyro, Mag)
-        # Acc/Gyro = indices 0-5
-        # Mag = indices 6-8
+        # sample = indices 0-8, acc_gyro = indices 0-5, mag = indices 6-8
+        # (6-axis packets report Mag as 0)
         
         # --- 2. UPDATE PLOTS ---
         # Update Acc/Gyro View
-        self.acc_gyro_view.update_view(new_data[:6])
+        self.acc_gyro_view.update_view(sensor_manager.acc_gyro)
         
-        # Update Magnetometer View (if data available)
-        if len(new_data) >= 9:
-            self.magnetometer_view.update_view(new_data[6:9])
+        # Update Magnetometer View
+        self.magnetometer_view.update_view(sensor_manager.mag)
 
         # --- 3. CALCULATE ORIENTATION & PHYSICS ---
-        ax, ay, az = new_data[0], new_data[1], new_data[2]
-        gx, gy, gz = new_data[3], new_data[4], new_data[5]
-
         # Calculate dt
-        current_time = time.time()
-        dt = current_time - self.last_update_time
-        self.last_update_time = current_time
+        # (monotonic clock: unaffected by NTP or wall-clock adjustments)
+        now_ns = time.monotonic_ns()
+        dt = (now_ns - self.last_update_ns) * 1e-9
+        self.last_update_ns = now_ns
+        # Cap it so a stall (window drag, late first packet) cannot blow up the integration
+        dt = min(dt, MAX_DT)
 
         # Update Physics Engine
-        pitch, roll, yaw, px, py, pz = self.sensor_fusion.update(ax, ay, az, gx, gy, gz, dt)
+        pitch, roll, yaw, px, py, pz = self.sensor_fusion.update(sensor_manager.sample, dt)
         
         # If in simulation mode, we OVERRIDE this physics position with the figure-8 for demo purposes
-        if self.sensor_manager.simulation_mode:
+        if sensor_manager.simulation_mode:
             # px, py, pz are already set at the top of update()
             pass
         else:
             # Real Mode: Use the Physics Integrated values
             pass
 
-        for axis_item in self.axes_items:
-            axis_item.resetTransform()
-            axis_item.translate(px, py, pz) # Move the object
-            axis_item.rotate(yaw,   0, 0, 1) # Rotate around Z
-            axis_item.rotate(pitch, 0, 1, 0) # Rotate around Y
-            axis_item.rotate(roll,  1, 0, 0) # Rotate around X
+        # Build the pose in one matrix.
+        # GLGraphicsItem.translate/rotate multiply on the left while Transform3D
+        # multiplies on the right, so the calls are listed in reverse order.
+        transform = pg.Transform3D()
+        transform.rotate(roll,  1, 0, 0) # Rotate around X
+        transform.rotate(pitch, 0, 1, 0) # Rotate around Y
+        transform.rotate(yaw,   0, 0, 1) # Rotate around Z
+        transform.translate(px, py, pz) # Move the object
+        self.axes.setTransform(transform)
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
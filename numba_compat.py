@@ -0,0 +1,19 @@
+"""
+Optional Numba support.
+
+Numeric hot paths are written as plain functions over floats and numpy
+arrays and decorated with `njit` from this module. When Numba is installed
+they are compiled to native code, otherwise they run as regular Python.
+"""
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit, usable bare or with arguments."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
@@ -1,4 +1,137 @@
 import math
+import numpy as np
+from numba_compat import njit, NUMBA_AVAILABLE
+
+# Layout of the mutable state array passed to fuse_step
+YAW, VX, VY, VZ, PX, PY, PZ = range(7)
+
+
+@njit(cache=True)
+def fast_atan2(y, x):
+    """
+    Polynomial atan2 approximation (Abramowitz & Stegun 4.4.49 style),
+    max error ~2e-4 rad (0.012 deg) - well below what the 3D view can show.
+    """
+    abs_x, abs_y = abs(x), abs(y)
+    if abs_x == 0 and abs_y == 0:
+        return 0.0
+
+    # atan on [0, 1], then unfold to the right octant and quadrant
+    a = min(abs_x, abs_y) / max(abs_x, abs_y)
+    s = a * a
+    r = ((-0.0464964749 * s + 0.15931422) * s - 0.327622764) * s * a + a
+    if abs_y > abs_x:
+        r = 0.5 * math.pi - r
+    if x < 0:
+        r = math.pi - r
+    if y < 0:
+        r = -r
+    return r
+
+
+# Without Numba the polynomial runs interpreted, which is slower than math.atan2
+_atan2 = fast_atan2 if NUMBA_AVAILABLE else math.atan2
+
+
+# Signature given explicitly so Numba compiles at import time, before the GUI timer starts.
+# The sample is passed as an array: unboxing six numpy scalars costs more than the maths.
+@njit("UniTuple(float64, 6)(float64[:], float64, float64[:], float64, float64, boolean)",
+      cache=True, fastmath=True)
+def fuse_step(sample, dt, state, gravity, deadzone, damping):
+    """
+    Single orientation + position update step (see SensorFusion.update).
+
+    Args:
+        sample: float64 array starting with [ax, ay, az (m/s^2), gx, gy, gz (deg/s)]
+        dt: Time delta in seconds
+        state: float64 array [yaw, vx, vy, vz, px, py, pz], updated in place
+        gravity: Gravity constant in m/s^2
+        deadzone: Linear acceleration threshold in m/s^2
+        damping: Whether to damp velocity to limit position drift
+
+    Returns:
+        tuple: (pitch, roll, yaw, px, py, pz)
+    """
+    ax, ay, az = sample[0], sample[1], sample[2]
+    gz = sample[5]
+
+    # --- 1. Orientation (Pitch/Roll from Acc, Yaw from Gyro) ---
+
+    # Pitch & Roll using Accelerometer (Trigonometry)
+    acc_magnitude_yz = math.sqrt(ay*ay + az*az)
+
+    # Their sines and cosines follow directly from the gravity vector, so
+    # only the reported angles need an (approximate) atan2
+    if acc_magnitude_yz != 0:
+        pitch_rad = _atan2(-ax, acc_magnitude_yz)
+        acc_magnitude = math.sqrt(ax*ax + ay*ay + az*az)
+        c_p, s_p = acc_magnitude_yz / acc_magnitude, -ax / acc_magnitude
+    else:
+        pitch_rad = 0.0
+        c_p, s_p = 1.0, 0.0
+
+    if az != 0:
+        roll_rad = _atan2(ay, az)
+        c_r, s_r = az / acc_magnitude_yz, ay / acc_magnitude_yz
+    else:
+        roll_rad = 0.0
+        c_r, s_r = 1.0, 0.0
+
+    # Yaw Integration (Gyro Z)
+    state[YAW] += gz * dt
+
+    # --- 2. Position Physics (Double Integration) ---
+
+    # Convert Euler angles to Radians for the rotation matrix
+    yaw_rad = math.radians(state[YAW])
+
+    # Precompute sines and cosines
+    c_y, s_y = math.cos(yaw_rad), math.sin(yaw_rad)
+
+    # Rotate Local Acceleration to World Frame
+    # X_World
+    ax_w = (c_y*c_p) * ax + \
+           (c_y*s_p*s_r - s_y*c_r) * ay + \
+           (c_y*s_p*c_r + s_y*s_r) * az
+
+    # Y_World
+    ay_w = (s_y*c_p) * ax + \
+           (s_y*s_p*s_r + c_y*c_r) * ay + \
+           (s_y*s_p*c_r - c_y*s_r) * az
+
+    # Z_World
+    az_w = (-s_p) * ax + \
+           (c_p*s_r) * ay + \
+           (c_p*c_r) * az
+
+    # Remove Gravity
+    az_w_linear = az_w - gravity
+
+    # Apply Deadzone
+    if abs(ax_w) < deadzone: ax_w = 0.0
+    if abs(ay_w) < deadzone: ay_w = 0.0
+    if abs(az_w_linear) < deadzone: az_w_linear = 0.0
+
+    # Integrate Acceleration -> Velocity
+    state[VX] += ax_w * dt
+    state[VY] += ay_w * dt
+    state[VZ] += az_w_linear * dt
+
+    # Apply Damping
+    if damping:
+        damping_factor = 0.95
+        state[VX] *= damping_factor
+        state[VY] *= damping_factor
+        state[VZ] *= damping_factor
+
+    # Integrate Velocity -> Position
+    state[PX] += state[VX] * dt
+    state[PY] += state[VY] * dt
+    state[PZ] += state[VZ] * dt
+
+    return (math.degrees(pitch_rad), math.degrees(roll_rad), state[YAW],
+            state[PX], state[PY], state[PZ])
+
 
 class SensorFusion:
     def __init__(self, damping=False, deadzone=0.0):
@@ -6,91 +139,32 @@ class SensorFusion:
         self.pitch = 0.0
         self.roll = 0.0
         self.yaw = 0.0
-        
+
         # Physics State (Position in meters, Velocity in m/s)
         self.px, self.py, self.pz = 0.0, 0.0, 0.0
-        self.vx, self.vy, self.vz = 0.0, 0.0, 0.0
-        
+
+        # Integrator state shared with fuse_step: [yaw, vx, vy, vz, px, py, pz]
+        self.state = np.zeros(7)
+
         # Configuration
-        self.enable_damping = damping
-        self.deadzone = deadzone
+        self.enable_damping = bool(damping)
+        self.deadzone = float(deadzone)
         self.gravity = 9.81 # m/s^2
 
-    def update(self, ax, ay, az, gx, gy, gz, dt):
+    def update(self, sample, dt):
         """
         Update orientation and position based on sensor data.
-        
+
         Args:
-            ax, ay, az: Accelerometer data in m/s^2
-            gx, gy, gz: Gyroscope data in deg/s
+            sample: float64 array starting with
+                    [ax, ay, az (m/s^2), gx, gy, gz (deg/s)];
+                    further entries (e.g. Mag) are ignored
             dt: Time delta in seconds
-            
+
         Returns:
             tuple: (pitch, roll, yaw, px, py, pz)
         """
-        # --- 1. Orientation (Pitch/Roll from Acc, Yaw from Gyro) ---
-        
-        # Pitch & Roll using Accelerometer (Trigonometry)
-        acc_magnitude_yz = math.sqrt(ay*ay + az*az)
-        
-        pitch_rad = math.atan2(-ax, acc_magnitude_yz) if acc_magnitude_yz != 0 else 0
-        roll_rad  = math.atan2(ay, az) if az != 0 else 0
-        
-        self.pitch = math.degrees(pitch_rad)
-        self.roll  = math.degrees(roll_rad)
-        
-        # Yaw Integration (Gyro Z)
-        self.yaw += gz * dt
-        
-        # --- 2. Position Physics (Double Integration) ---
-        
-        # Convert Euler angles to Radians for the rotation matrix
-        yaw_rad = math.radians(self.yaw)
-        
-        # Precompute sines and cosines
-        c_y, s_y = math.cos(yaw_rad), math.sin(yaw_rad)
-        c_p, s_p = math.cos(pitch_rad), math.sin(pitch_rad)
-        c_r, s_r = math.cos(roll_rad), math.sin(roll_rad)
-        
-        # Rotate Local Acceleration to World Frame
-        # X_World
-        ax_w = (c_y*c_p) * ax + \
-               (c_y*s_p*s_r - s_y*c_r) * ay + \
-               (c_y*s_p*c_r + s_y*s_r) * az
-
-        # Y_World
-        ay_w = (s_y*c_p) * ax + \
-               (s_y*s_p*s_r + c_y*c_r) * ay + \
-               (s_y*s_p*c_r - c_y*s_r) * az
-               
-        # Z_World
-        az_w = (-s_p) * ax + \
-               (c_p*s_r) * ay + \
-               (c_p*c_r) * az
-               
-        # Remove Gravity
-        az_w_linear = az_w - self.gravity
-        
-        # Apply Deadzone
-        if abs(ax_w) < self.deadzone: ax_w = 0
-        if abs(ay_w) < self.deadzone: ay_w = 0
-        if abs(az_w_linear) < self.deadzone: az_w_linear = 0
-        
-        # Integrate Acceleration -> Velocity
-        self.vx += ax_w * dt
-        self.vy += ay_w * dt
-        self.vz += az_w_linear * dt
-        
-        # Apply Damping
-        if self.enable_damping:
-            damping_factor = 0.95
-            self.vx *= damping_factor
-            self.vy *= damping_factor
-            self.vz *= damping_factor
-            
-        # Integrate Velocity -> Position
-        self.px += self.vx * dt
-        self.py += self.vy * dt
-        self.pz += self.vz * dt
-        
-        return self.pitch, self.roll, self.yaw, self.px, self.py, self.pz
+        result = fuse_step(sample, dt, self.state,
+                           self.gravity, self.deadzone, self.enable_damping)
+        self.pitch, self.roll, self.yaw, self.px, self.py, self.pz = result
+        return result
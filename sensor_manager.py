@@ -1,121 +1,386 @@
+import re
+import threading
+import time
 import serial
 import numpy as np
+from numba_compat import njit, NUMBA_AVAILABLE
+
+# Signature given explicitly so Numba compiles at import, not on the reader thread's first packet
+@njit("int64(uint8[:], int64, int64, float64[:], float64[:])", cache=True)
+def parse_packet(data, start, end, scale, out):
+    """
+    Parses whitespace-separated decimal numbers (e.g. "-12.5 3 1e-2") from an
+    ASCII byte array straight into out, without creating Python objects.
+    Each value is multiplied by its factor in scale as it is stored.
+
+    Args:
+        data: uint8 array, typically a view on the whole receive buffer
+        start, end: Bounds of the packet payload (between '$' and ';') in data
+        scale: float64 array of per-value factors, at least len(out) long
+        out: float64 array receiving the scaled values
+
+    Returns:
+        int: Number of values parsed, or -1 if the payload is malformed
+             or holds more than len(out) values
+    """
+    size = end
+    n = 0
+    i = start
+    while True:
+        # Skip separators (space, \t, \n, \v, \f, \r)
+        while i < size and (data[i] == 32 or 9 <= data[i] <= 13):
+            i += 1
+        if i == size:
+            return n
+        if n == out.shape[0]:
+            return -1
+
+        negative = False
+        if data[i] == 45 or data[i] == 43: # '-' / '+'
+            negative = data[i] == 45
+            i += 1
+
+        # Mantissa digits, with an optional fractional part
+        mantissa = 0.0
+        exponent = 0
+        digits = 0
+        while i < size and 48 <= data[i] <= 57:
+            mantissa = mantissa * 10.0 + (data[i] - 48)
+            digits += 1
+            i += 1
+        if i < size and data[i] == 46: # '.'
+            i += 1
+            while i < size and 48 <= data[i] <= 57:
+                mantissa = mantissa * 10.0 + (data[i] - 48)
+                exponent -= 1
+                digits += 1
+                i += 1
+        if digits == 0:
+            return -1
+
+        # Optional exponent
+        if i < size and (data[i] == 101 or data[i] == 69): # 'e' / 'E'
+            i += 1
+            exp_negative = False
+            if i < size and (data[i] == 45 or data[i] == 43):
+                exp_negative = data[i] == 45
+                i += 1
+            exp_value = 0
+            exp_digits = 0
+            while i < size and 48 <= data[i] <= 57:
+                exp_value = exp_value * 10 + (data[i] - 48)
+                exp_digits += 1
+                i += 1
+            if exp_digits == 0:
+                return -1
+            exponent += -exp_value if exp_negative else exp_value
+
+        # A number must end at a separator or at the end of the payload
+        if i < size and not (data[i] == 32 or 9 <= data[i] <= 13):
+            return -1
+
+        # Divide by exact powers of ten rather than multiplying by inexact 10^-k
+        if exponent < 0:
+            value = mantissa / 10.0 ** (-exponent)
+        else:
+            value = mantissa * 10.0 ** exponent
+        out[n] = (-value if negative else value) * scale[n]
+        n += 1
+
+@njit("int64(float64[:, :], int64, float64[:], float64[:], float64[:])", cache=True, fastmath=True)
+def sim_step(noise, row, sigma, mean, out):
+    """
+    Writes one simulated sample, out = noise[row] * sigma + mean, in a single
+    fused loop.
+
+    Args:
+        noise: (R, n) float64 array of unit normal noise, R a power of two
+        row: Row of noise to use
+        sigma, mean: float64 arrays of n per-channel noise scales and offsets
+        out: float64 array of n values receiving the sample
+
+    Returns:
+        int: Next row of noise to use (wraps around)
+    """
+    for i in range(out.shape[0]):
+        out[i] = noise[row, i] * sigma[i] + mean[i]
+    return (row + 1) & (noise.shape[0] - 1)
+
+# Newest well-formed $...; packet in a buffer. The greedy .* makes the regex
+# engine backtrack from the end, so only the tail of the buffer is examined.
+LAST_PACKET_RE = re.compile(rb'.*\$([^$;]*);', re.DOTALL)
 
 class SensorManager:
     # Conversion Constants
     MG_TO_MS2 = 9.80665 / 1000.0
     MDPS_TO_DPS = 1.0 / 1000.0
 
+    # Largest magnitude accepted in a sample: the plot history is float32
+    MAX_ABS_VALUE = float(np.finfo(np.float32).max)
+
+    SIM_NOISE_ROWS = 65536 # Power of two, so the row index wraps with a mask
+    SIM_PERIOD = 0.02 # Simulated sample period (s), 50 Hz
+
+    READ_RETRY_DELAY = 0.1 # Back-off (s) after a failed serial read
+    MAX_READ_ERRORS = 10 # Consecutive failed reads after which the port is given up
+
     def __init__(self, port='/dev/ttyACM0', baud=115200, simulation_mode=True):
         self.port = port
         self.baud = baud
         self.simulation_mode = simulation_mode
         self.ser = None
         self.sim_t = 0
-        self.buffer = "" # Persistent buffer for serial data
+        self.buffer = bytearray() # Persistent buffer for raw serial bytes (reader thread only)
+        self._scan_from = 0 # self.buffer[:_scan_from] is known to hold no ';'
+
+        # Latest sample in SI units, updated in place by poll():
+        # [ax, ay, az (m/s^2), gx, gy, gz (deg/s), mx, my, mz (Gauss)]
+        # with fixed views on its Acc/Gyro and Mag parts
+        self.sample = np.zeros(9)
+        self.acc_gyro = self.sample[:6]
+        self.mag = self.sample[6:9]
+
+        # Reader thread parses into its own scratch array, then copies it into
+        # the shared slot under the lock, so no array is allocated per packet
+        self._packet = np.zeros(9) # Reader thread only
+        self._latest = np.zeros(9)
+        self._has_new = False
+        self._lock = threading.Lock()
+        self._reader = None
+        self._running = False
+
+        # Optional callable invoked from the reader thread when a new packet is
+        # available; called once until poll() picks packets up again
+        self.on_sample = None
+        self._notify_pending = False
+
+        # Set by the reader thread when it gives up on the port (e.g. unplugged);
+        # on_error, if set, is then called from the reader thread with the message
+        self.error = None
+        self.on_error = None
+
+        # Per-channel Raw (mg, mdps, Gauss) -> SI (m/s^2, deg/s, Gauss) factors
+        self._scale = np.array([self.MG_TO_MS2] * 3 + [self.MDPS_TO_DPS] * 3 + [1.0] * 3)
+
+        # Simulated Steady Board (raw units)
+        # Acc: Gravity on Z (+1000 mg), 10 mg noise
+        # Gyro: Near 0, 50 mdps noise
+        # Mag: Pointing North (~0.5 Gauss), 0.01 Gauss noise
+        self._rng = np.random.default_rng()
+        self._sim_mean = np.array([0.0, 0.0, 1000.0, 0.0, 0.0, 0.0, 0.5, 0.0, -0.5])
+        self._sim_sigma = np.array([10.0] * 3 + [50.0] * 3 + [0.01] * 3)
+        # Same model pre-converted to SI, so a sample is one multiply-add
+        self._sim_sigma_si = self._sim_sigma * self._scale
+        self._sim_mean_si = self._sim_mean * self._scale
 
         if not self.simulation_mode:
             try:
                 self.ser = serial.Serial(self.port, self.baud, timeout=0.1)
                 print(f"Connected to {self.port}")
+
+                # Acquire on a background thread so packets are read as soon as they
+                # arrive, independently of the GUI refresh rate
+                self._running = True
+                self._reader = threading.Thread(target=self._read_loop, name="SerialReader", daemon=True)
+                self._reader.start()
             except Exception as e:
                 print(f"Serial Error: {e}")
                 print("Switching to SIMULATION_MODE")
                 self.simulation_mode = True
 
+        if self.simulation_mode:
+            # Pre-generated unit noise, cycled one row per simulated sample so the
+            # RNG is not called on the hot path (~22 min period at 50 Hz)
+            self._noise = self._rng.standard_normal((self.SIM_NOISE_ROWS, 9))
+            self._noise_idx = 0
+            self._sim_deadline = time.perf_counter() # Earliest time of the next sample
+            # Numba availability is fixed too, so pick the sample generator once
+            self._sim_step = self._sim_step_numba if NUMBA_AVAILABLE else self._sim_step_ufunc
+
+        # poll() fetches the next sample into self.sample (and so self.acc_gyro
+        # and self.mag), in SI units:
+        #   [ax, ay, az (m/s^2), gx, gy, gz (deg/s), mx, my, mz (Gauss)]
+        # converted from the mg, mdps, Gauss of the (Sim or Real) input, and
+        # returns True if a new sample was stored, False if none is available.
+        # The mode is fixed from here on, so the matching implementation is bound
+        # on the instance and the per-sample path does not re-check it.
+        self.poll = self._poll_simulation if self.simulation_mode else self._poll_serial
+
+    def _poll_simulation(self):
+        """poll() for simulation mode: one new sample per SIM_PERIOD at most."""
+        now = time.perf_counter()
+        if now < self._sim_deadline:
+            return False # Polled faster than the simulated rate, keep the last sample
+        # Advance on a fixed grid so the long-run rate stays at 1/SIM_PERIOD, but keep
+        # the deadline half a period ahead of now so callers running at the same rate
+        # (e.g. the 20 ms GUI timer) are not skipped because of timer jitter
+        self._sim_deadline = max(self._sim_deadline + self.SIM_PERIOD, now + 0.5 * self.SIM_PERIOD)
+
+        self.sim_t += self.SIM_PERIOD # Advance time slightly
+        self._sim_step()
+        return True
+
+    def _sim_step_numba(self):
+        """Writes the next simulated sample into self.sample with the fused kernel."""
+        # Noise and offsets are already in SI Units
+        self._noise_idx = sim_step(self._noise, self._noise_idx,
+                                   self._sim_sigma_si, self._sim_mean_si, self.sample)
+
+    def _sim_step_ufunc(self):
+        """_sim_step_numba for when Numba is missing."""
+        # A Python loop over the channels would be slower than two ufunc calls
+        np.multiply(self._noise[self._noise_idx], self._sim_sigma_si, out=self.sample)
+        self.sample += self._sim_mean_si
+        self._noise_idx = (self._noise_idx + 1) & (self.SIM_NOISE_ROWS - 1)
+
+    def _poll_serial(self):
+        """poll() for real mode: takes the newest packet published by the reader thread."""
+        # Cleared before taking the packet, so one published meanwhile notifies again
+        self._notify_pending = False
+        with self._lock:
+            if not self._has_new:
+                return False # No new packet since the last call
+            self.sample[:] = self._latest
+            self._has_new = False
+        return True
+
     def get_next_sample(self):
         """
-        Returns a numpy array of 9 floats in SI units:
-        [ax (m/s^2), ay (m/s^2), az (m/s^2),
-         gx (deg/s), gy (deg/s), gz (deg/s),
-         mx (Gauss), my (Gauss), mz (Gauss)]
-        
-        Input data (Sim or Real) is assumed to be in mg, mdps, Gauss.
+        Returns self.sample after a successful poll(), or None if no new
+        sample is available. The array is overwritten by the next call,
+        so callers that keep it beyond that must copy it.
         """
-        if self.simulation_mode:
-            self.sim_t += 0.02 # Advance time slightly
-            new_data = np.zeros(9)
-            
-            # Simulate Steady Board with Noise
-            # Acc: Gravity on Z (+1000 mg), others near 0
-            noise_acc_mg = 10.0 # mg (Reduced from 50.0)
-            new_data[0] = np.random.normal(0, noise_acc_mg)        # Acc X (mg)
-            new_data[1] = np.random.normal(0, noise_acc_mg)        # Acc Y (mg)
-            new_data[2] = 1000.0 + np.random.normal(0, noise_acc_mg) # Acc Z (mg)
-            
-            # Gyro: Near 0
-            noise_gyro_mdps = 50.0 # mdps (Reduced from 500.0)
-            new_data[3] = np.random.normal(0, noise_gyro_mdps) # Gyro X (mdps)
-            new_data[4] = np.random.normal(0, noise_gyro_mdps) # Gyro Y (mdps)
-            new_data[5] = np.random.normal(0, noise_gyro_mdps) # Gyro Z (mdps)
-            
-            # Mag: Simulate pointing North (~0.5 Gauss)
-            noise_mag = 0.01
-            new_data[6] = 0.5 + np.random.normal(0, noise_mag)  # Mag X
-            new_data[7] = np.random.normal(0, noise_mag)        # Mag Y
-            new_data[8] = -0.5 + np.random.normal(0, noise_mag) # Mag Z
-            
-            # Convert to SI Units
-            new_data[0:3] *= self.MG_TO_MS2
-            new_data[3:6] *= self.MDPS_TO_DPS
-            
-            return new_data
-        
-        else:
-            if self.ser and self.ser.in_waiting:
-                try:
-                    # Read everything currently in the hardware buffer
-                    raw_data = self.ser.read(self.ser.in_waiting)
-                    text_data = raw_data.decode('utf-8', errors='ignore')
-                    self.buffer += text_data
-                    
-                    # Process packets in the buffer
-                    last_valid_packet = None
-                    
-                    while True:
-                        # Find next delimiter pair
-                        start_idx = self.buffer.find('$')
-                        end_idx = self.buffer.find(';')
-                        
-                        if start_idx != -1 and end_idx != -1 and start_idx > end_idx:
-                            self.buffer = self.buffer[end_idx+1:]
-                            continue
-
-                        if start_idx != -1 and end_idx != -1:
-                            packet_str = self.buffer[start_idx+1 : end_idx]
-                            self.buffer = self.buffer[end_idx+1:]
-                            
-                            try:
-                                parts = packet_str.split(' ')
-                                parts = [p for p in parts if p] # Filter empty
-                                
-                                packet_data = None
-                                if len(parts) == 6:
-                                    # Backward compatibility: 6-axis
-                                    data = [float(x) for x in parts]
-                                    data.extend([0.0, 0.0, 0.0])
-                                    packet_data = np.array(data)
-                                elif len(parts) == 9:
-                                    packet_data = np.array([float(x) for x in parts])
-                                
-                                if packet_data is not None:
-                                    # Convert Raw (mg, mdps) to SI (m/s^2, deg/s)
-                                    packet_data[0:3] *= self.MG_TO_MS2
-                                    packet_data[3:6] *= self.MDPS_TO_DPS
-                                    last_valid_packet = packet_data
-                                    
-                            except ValueError:
-                                pass 
-                        else:
-                            break
-                            
-                    if len(self.buffer) > 1000:
-                        self.buffer = ""
-                        
-                    return last_valid_packet
-
-                except Exception as e:
-                    print(f"Serial Read Error: {e}")
-                    return None
-            else:
-                return None
+        return self.sample if self.poll() else None
+
+    def close(self):
+        """Stops the reader thread and releases the serial port."""
+        self._running = False
+        if self._reader is not None:
+            self._reader.join()
+            self._reader = None
+        if self.ser is not None:
+            self.ser.close()
+            self.ser = None
+
+    def _read_loop(self):
+        """Reader thread: blocks on the serial port and publishes the newest packet."""
+        read_errors = 0
+        while self._running:
+            try:
+                # Block for the first byte (up to the port timeout), then take the rest
+                raw_data = self.ser.read(self.ser.in_waiting or 1)
+            except (serial.SerialException, OSError) as e:
+                # Retry a transient failure after a short back-off; one that
+                # persists means the port is gone
+                read_errors += 1
+                if read_errors >= self.MAX_READ_ERRORS:
+                    self._report_error(f"Serial Read Error: {e}")
+                    return
+                time.sleep(self.READ_RETRY_DELAY)
+                continue
+            read_errors = 0
+            if not raw_data:
+                continue
+            self.buffer += raw_data
+
+            try:
+                found = self._parse_latest_packet(self._packet)
+            except Exception as e:
+                # A bad packet must not stop acquisition: drop the buffered bytes
+                print(f"Serial Parse Error: {e}")
+                self.buffer.clear()
+                self._scan_from = 0
+                continue
+
+            if found:
+                with self._lock:
+                    self._latest[:] = self._packet
+                    self._has_new = True
+                if self.on_sample is not None and not self._notify_pending:
+                    self._notify_pending = True
+                    self.on_sample()
+
+    def _report_error(self, message):
+        """Reader thread: stops acquisition and reports why through error/on_error."""
+        print(message)
+        self.error = message
+        self._running = False
+        if self.on_error is not None:
+            self.on_error(message)
+
+    def _parse_latest_packet(self, out):
+        """
+        Consumes all complete $...; packets in self.buffer and writes the most
+        recent valid one into out (9 floats, SI units).
+
+        Returns:
+            bool: True if out holds a new packet, False otherwise
+        """
+        # Only the most recent valid packet is returned, so walk the
+        # packets backwards from the newest instead of parsing every one.
+        # Bytes searched on an earlier call hold no ';' and are skipped.
+        end_idx = self.buffer.rfind(b';', self._scan_from)
+        if end_idx == -1:
+            if len(self.buffer) > 1000:
+                self.buffer.clear()
+            self._scan_from = len(self.buffer)
+            return False
+
+        found = False
+        frame_end = end_idx + 1
+        while not found:
+            # Skips trailing garbage such as a packet whose '$' was lost
+            match = LAST_PACKET_RE.match(self.buffer, 0, frame_end)
+            if not match:
+                break
+            start, end = match.span(1)
+            found = self._parse_frame(start, end, out)
+            frame_end = start - 1 # Stop before this frame's '$'
+
+        # Drop all consumed packets in one go (keeps any partial tail)
+        del self.buffer[:end_idx+1]
+        self._scan_from = len(self.buffer) # The partial tail holds no ';' either
+        return found
+
+    def _parse_frame(self, start, end, out):
+        """
+        Parses the payload self.buffer[start:end] of one $...; frame into out
+        (9 floats, SI units).
+
+        Returns:
+            bool: True if it is a valid 6- or 9-axis packet, False otherwise
+        """
+        n_axes = -1
+        if NUMBA_AVAILABLE:
+            # Parse in place through a zero-copy view of the receive buffer
+            data = np.frombuffer(self.buffer, dtype=np.uint8)
+            n_axes = parse_packet(data, start, end, self._scale, out)
+            del data # Release the buffer export so the bytearray can be resized
+        if n_axes < 0:
+            # Python path: without Numba, or for syntax the kernel rejects
+            n_axes = self._parse_fields(self.buffer[start:end], self._scale, out)
+
+        if n_axes != 6 and n_axes != 9:
+            return False
+        # NaN/inf (or values overflowing float32, such as 1e39) would poison the
+        # fusion integrator and the plots, which skip their finite check
+        if not (np.abs(out[:n_axes]) <= self.MAX_ABS_VALUE).all():
+            return False
+        if n_axes == 6:
+            out[6:] = 0.0 # 6-axis packets (backward compatibility) report Mag as 0
+        return True
+
+    @staticmethod
+    def _parse_fields(payload, scale, out):
+        """Python equivalent of parse_packet, based on bytes.split() and float()."""
+        # bytes, not bytearray: numpy would treat bytearray fields as sequences
+        parts = bytes(payload).split() # Also filters empty fields
+        n = len(parts)
+        if n > len(out):
+            return -1
+        try:
+            values = np.array(parts, dtype=np.float64)
+        except ValueError:
+            return -1
+        np.multiply(values, scale[:n], out=out[:n])
+        return n
@@ -1,4 +1,5 @@
 import sys
+import math
 import serial
 import numpy as np
 import pyqtgraph as pg
@@ -22,23 +23,32 @@ curve = p1.plot(pen='y') # Yellow line
 data_buffer = np.zeros(100)
 ptr = 0
 
+# Simulated sine wave state: (sin, cos) of the current phase, advanced by a
+# fixed 0.1 rad rotation each tick instead of calling sin() every time
+SIM_STEP_COS, SIM_STEP_SIN = math.cos(0.1), math.sin(0.1)
+sim_sin, sim_cos = 0.0, 1.0
+
 if USE_REAL_SERIAL:
     ser = serial.Serial(SERIAL_PORT, BAUD_RATE)
 
 def update():
-    global data_buffer, ptr
+    global data_buffer, ptr, sim_sin, sim_cos
     
     val = 0
     if USE_REAL_SERIAL:
         if ser.in_waiting:
             try:
-                line = ser.readline().decode().strip()
-                val = float(line.split(',')[0]) # Assume format: "123.45\n"
+                # float() accepts ASCII bytes (and ignores surrounding whitespace),
+                # so the line is never decoded to str
+                line = ser.readline()
+                val = float(line.split(b',')[0]) # Assume format: "123.45\n"
             except:
                 return
     else:
-        # Simulation: Generate a sine wave
-        val = np.sin(ptr / 10) 
+        # Simulation: Generate a sine wave (sin(ptr / 10))
+        val = sim_sin
+        sim_sin, sim_cos = (sim_sin * SIM_STEP_COS + sim_cos * SIM_STEP_SIN,
+                            sim_cos * SIM_STEP_COS - sim_sin * SIM_STEP_SIN)
 
     # Shift data and add new value
     data_buffer[:-1] = data_buffer[1:]
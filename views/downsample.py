@@ -0,0 +1,44 @@
+import numpy as np
+from numba_compat import njit
+
+@njit(cache=True)
+def m4_downsample(y, width):
+    """
+    M4 aggregation: splits y into `width` buckets (one per pixel column) and
+    keeps the first, min, max and last sample of each, in x order. The line
+    drawn through these points is pixel-identical to the full-resolution one.
+
+    y: 1D array of samples, plotted at x = 0..len(y)-1
+    width: Number of pixel columns the curve spans
+
+    Returns:
+        tuple: (x, y) float32 arrays with at most 4 * width points
+    """
+    n = y.shape[0]
+    out_x = np.empty(4 * width, dtype=np.float32)
+    out_y = np.empty(4 * width, dtype=np.float32)
+    k = 0
+    for b in range(width):
+        start = b * n // width
+        end = (b + 1) * n // width
+        if start == end:
+            continue
+
+        i_min = start
+        i_max = start
+        for i in range(start + 1, end):
+            if y[i] < y[i_min]:
+                i_min = i
+            if y[i] > y[i_max]:
+                i_max = i
+
+        # first, min/max (whichever comes first), last - skipping repeats
+        prev = -1
+        for i in (start, min(i_min, i_max), max(i_min, i_max), end - 1):
+            if i != prev:
+                out_x[k] = i
+                out_y[k] = y[i]
+                k += 1
+                prev = i
+
+    return out_x[:k], out_y[:k]
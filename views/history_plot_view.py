@@ -0,0 +1,87 @@
+import numpy as np
+import pyqtgraph as pg
+from PyQt5.QtWidgets import QWidget, QVBoxLayout
+from views.downsample import m4_downsample
+
+class HistoryPlotView(QWidget):
+    """
+    Base for the 2D views: a grid of plots, one curve per channel, showing
+    the last history_length samples of each channel.
+    """
+    def __init__(self, n_channels, parent=None):
+        super().__init__(parent)
+        self.layout = QVBoxLayout(self)
+        self.w_charts = pg.GraphicsLayoutWidget()
+        self.layout.addWidget(self.w_charts)
+
+        # Filled by add_plot(), one entry per channel (data_buffer row)
+        self.plots = []
+        self.curves = []
+
+        self.history_length = 200
+        # Ring buffer: each sample overwrites the oldest column at write_pos, so
+        # nothing is shifted per sample. Every sample is written twice, at
+        # write_pos and write_pos + history_length, so the history oldest -> newest
+        # is always the contiguous slice [write_pos, write_pos + history_length).
+        # float32 halves the bytes moved and matches what pyqtgraph draws
+        self.data_buffer = np.zeros((n_channels, 2 * self.history_length), dtype=np.float32)
+        self.write_pos = 0
+        # Snapshot of the window handed to the curves: pyqtgraph keeps the arrays
+        # it is given, so they must not change until the next redraw
+        self._history = np.empty((n_channels, self.history_length), dtype=np.float32)
+        # Fixed x coordinates, so setData() does not build an arange per curve and frame
+        self._x = np.arange(self.history_length, dtype=np.float32)
+
+        # Buffers take every sample, curves are only redrawn every N-th update
+        self.redraw_interval = 2 # 25 Hz visual refresh at the 50 Hz data rate
+        self.update_count = 0
+
+    def add_plot(self, row, col, title, pen):
+        """Adds a plot with one curve for the next channel and returns the plot."""
+        p = self.w_charts.addPlot(row=row, col=col, title=title)
+        p.showGrid(x=True, y=True)
+        # Only rasterize what is visible, at most ~2 points per pixel
+        p.setClipToView(True)
+        p.setDownsampling(auto=True, mode='peak')
+        c = p.plot(pen=pen, skipFiniteCheck=True) # Samples are always finite
+
+        self.plots.append(p)
+        self.curves.append(c)
+        return p
+
+    def push_sample(self, column):
+        """
+        Appends one sample (one value per channel, in curve order) to the
+        history and redraws the curves when due.
+        """
+        # Overwrite the oldest column (in both halves)
+        self.data_buffer[:, self.write_pos] = column
+        self.data_buffer[:, self.write_pos + self.history_length] = column
+        self.write_pos = (self.write_pos + 1) % self.history_length
+
+        self.update_count += 1
+        # While hidden (e.g. the inactive dock tab) keep buffering but skip drawing
+        if self.update_count % self.redraw_interval or not self.isVisible():
+            return
+
+        self.redraw()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Catch up with the samples buffered while hidden
+        self.redraw()
+
+    def redraw(self):
+        """Pushes the buffered history to the curves."""
+        # Contiguous window oldest -> newest, copied in one block into the snapshot
+        history = self._history
+        np.copyto(history, self.data_buffer[:, self.write_pos:self.write_pos + self.history_length])
+
+        for i, curve in enumerate(self.curves):
+            y = history[i]
+            # M4-reduce to 4 points per pixel column when the plot is narrower than the history
+            width = int(self.plots[i].getViewBox().width())
+            if 0 < width and len(y) > 4 * width:
+                curve.setData(*m4_downsample(y, width))
+            else:
+                curve.setData(x=self._x, y=y)